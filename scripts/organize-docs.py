@@ -6,11 +6,14 @@ Organize Markdown docs: move stray files into docs/ folders and update links.
 from __future__ import annotations
 
 import argparse
+import concurrent.futures
 import os
 import pathlib
+import re
 import shutil
+import stat
 import sys
-from typing import Dict, Iterable, List, Sequence, Tuple
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
 
 ROOT = pathlib.Path(__file__).resolve().parent.parent
 
@@ -34,6 +37,8 @@ ALLOWED_PREFIXES = {
     ROOT / ".github",
     ROOT / ".kiro",
 }
+_ALLOWED_PREFIX_STRS = tuple(f"{prefix.as_posix()}/" for prefix in ALLOWED_PREFIXES)
+_ALLOWED_EXACT_STRS = {path.as_posix() for path in ALLOWED_ROOT_FILES | ALLOWED_PREFIXES}
 
 TEXT_SUFFIXES = {
     ".md",
@@ -53,128 +58,209 @@ TEXT_SUFFIXES = {
     ".scss",
     ".txt",
 }
+TEXT_SUFFIXES_TUPLE = tuple(TEXT_SUFFIXES)
+
+_FOLDER_RULES: Sequence[Tuple[Sequence[str], str]] = (
+    (("NEWS", "SECURITY"), "docs/news/security"),
+    (("NEWS",), "docs/news"),
+    (("ADMIN",), "docs/admin"),
+    (("COMMENT",), "docs/comments"),
+    (("DESIGN", "TOKEN"), "docs/design-tokens"),
+    (("ACCESS",), "docs/accessibility"),
+    (("INTERFACE",), "docs/interface"),
+    (("OPTIMISTIC",), "docs/optimistic-ui"),
+    (("SCOPE",), "docs/query-scopes"),
+    (("SECURITY",), "docs/security"),
+    (("VALIDATION",), "docs/validation"),
+    (("REQUEST",), "docs/validation"),
+    (("ROUTE",), "docs/routing"),
+    (("UI",), "docs/ui-ux"),
+    (("UX",), "docs/ui-ux"),
+    (("TAILWIND",), "docs/ui-ux"),
+    (("MODAL",), "docs/ui-ux"),
+    (("PROJECT",), "docs/project"),
+    (("PLAN",), "docs/planning"),
+    (("TODO",), "docs/planning"),
+    (("TASK",), "docs/planning"),
+    (("DOCUMENTATION",), "docs/documentation"),
+    (("I18N",), "docs/i18n"),
+    (("LOCALE",), "docs/i18n"),
+    (("LIVEWIRE",), "docs/livewire"),
+    (("VOLT",), "docs/volt"),
+    (("API",), "docs/api"),
+)
+
+# Lookahead so overlapping keywords are all reported; rule order above still
+# decides which folder wins.
+_KEYWORD_RE = re.compile(
+    "(?=(" + "|".join(dict.fromkeys(k for keywords, _ in _FOLDER_RULES for k in keywords)) + "))"
+)
 
 
-def should_skip(path: pathlib.Path) -> bool:
-    return any(part in SKIP_DIRS for part in path.parts)
+def is_allowed(path: pathlib.Path) -> bool:
+    posix = path.as_posix()
+    return posix in _ALLOWED_EXACT_STRS or posix.startswith(_ALLOWED_PREFIX_STRS)
 
 
-def is_allowed(path: pathlib.Path) -> bool:
-    if path in ALLOWED_ROOT_FILES:
-        return True
-    return any(prefix in path.parents or path == prefix for prefix in ALLOWED_PREFIXES)
+def _walk(
+    root: pathlib.Path, suffixes: Tuple[str, ...] | None = None
+) -> Iterable[Tuple[pathlib.Path, str]]:
+    """Yield (path, posix path relative to root) for files under root.
 
+    SKIP_DIRS are pruned before descending into them.
+    """
+    root_len = len(str(root)) + 1
+    for dirpath, dirs, files in os.walk(root):
+        dirs[:] = [name for name in dirs if name not in SKIP_DIRS]
+        rel_dir = dirpath[root_len:].replace(os.sep, "/")
+        prefix = f"{rel_dir}/" if rel_dir else ""
+        # files may include broken symlinks and other non-regular entries;
+        # _rewrite_links skips those, so the walk itself never stats.
+        for name in files:
+            if suffixes is None or name.endswith(suffixes):
+                yield pathlib.Path(dirpath, name), prefix + name
+
+
+def scan_repo() -> Tuple[Dict[pathlib.Path, str], List[pathlib.Path]]:
+    """Walk the repo once.
+
+    Returns markdown files mapped to their ROOT-relative posix paths, and all
+    text files.
+    """
+    md_files: Dict[pathlib.Path, str] = {}
+    text_files: List[pathlib.Path] = []
+    for path, rel in _walk(ROOT, TEXT_SUFFIXES_TUPLE):
+        text_files.append(path)
+        if path.name.endswith(".md"):
+            md_files[path] = rel
+    return md_files, text_files
 
-def find_markdown() -> Iterable[pathlib.Path]:
-    for path in ROOT.rglob("*.md"):
-        if should_skip(path):
-            continue
-        yield path
 
+def find_stray_markdown(md_files: Iterable[pathlib.Path]) -> List[pathlib.Path]:
+    return [path for path in md_files if not is_allowed(path)]
 
-def find_stray_markdown() -> List[pathlib.Path]:
-    return [path for path in find_markdown() if not is_allowed(path)]
+
+def apply_moves(
+    paths: Iterable[pathlib.Path], moves: Sequence[Tuple[pathlib.Path, pathlib.Path]]
+) -> List[pathlib.Path]:
+    moved = dict(moves)
+    return [moved.get(path, path) for path in paths]
 
 
 def guess_target_folder(filename: str) -> pathlib.Path:
     name = filename.upper()
-    patterns: Sequence[Tuple[Sequence[str], str]] = (
-        (("NEWS", "SECURITY"), "docs/news/security"),
-        (("NEWS",), "docs/news"),
-        (("ADMIN",), "docs/admin"),
-        (("COMMENT",), "docs/comments"),
-        (("DESIGN", "TOKEN"), "docs/design-tokens"),
-        (("ACCESS",), "docs/accessibility"),
-        (("INTERFACE",), "docs/interface"),
-        (("OPTIMISTIC",), "docs/optimistic-ui"),
-        (("SCOPE",), "docs/query-scopes"),
-        (("SECURITY",), "docs/security"),
-        (("VALIDATION",), "docs/validation"),
-        (("REQUEST",), "docs/validation"),
-        (("ROUTE",), "docs/routing"),
-        (("UI",), "docs/ui-ux"),
-        (("UX",), "docs/ui-ux"),
-        (("TAILWIND",), "docs/ui-ux"),
-        (("MODAL",), "docs/ui-ux"),
-        (("PROJECT",), "docs/project"),
-        (("PLAN",), "docs/planning"),
-        (("TODO",), "docs/planning"),
-        (("TASK",), "docs/planning"),
-        (("DOCUMENTATION",), "docs/documentation"),
-        (("I18N",), "docs/i18n"),
-        (("LOCALE",), "docs/i18n"),
-        (("LIVEWIRE",), "docs/livewire"),
-        (("VOLT",), "docs/volt"),
-        (("API",), "docs/api"),
-    )
-    for keywords, folder in patterns:
-        if all(keyword in name for keyword in keywords):
-            return ROOT / folder
+    found = {match.group(1) for match in _KEYWORD_RE.finditer(name)}
+    if found:
+        for keywords, folder in _FOLDER_RULES:
+            if found.issuperset(keywords):
+                return ROOT / folder
     return ROOT / "docs/misc"
 
 
 def move_stray_files(stray_files: Sequence[pathlib.Path]) -> List[Tuple[pathlib.Path, pathlib.Path]]:
     moves: List[Tuple[pathlib.Path, pathlib.Path]] = []
+    created_dirs: Set[pathlib.Path] = set()
     for source in stray_files:
         target_dir = guess_target_folder(source.stem)
-        target_dir.mkdir(parents=True, exist_ok=True)
+        if target_dir not in created_dirs:
+            target_dir.mkdir(parents=True, exist_ok=True)
+            created_dirs.add(target_dir)
         destination = target_dir / source.name
         if destination.exists():
             raise SystemExit(
                 f"Refusing to overwrite existing file: {destination}. "
                 f"Resolve the conflict and rerun the command."
             )
-        shutil.move(str(source), str(destination))
+        try:
+            os.rename(source, destination)
+        except OSError:
+            # e.g. docs/ symlinked onto another filesystem.
+            shutil.move(str(source), str(destination))
         moves.append((source, destination))
     return moves
 
 
-def iter_text_files() -> Iterable[pathlib.Path]:
-    for path in ROOT.rglob("*"):
-        if not path.is_file():
+def _rewrite_links(
+    file_path: pathlib.Path,
+    abs_moves: Sequence[Tuple[pathlib.Path, pathlib.Path, str]],
+    moved_basenames: Sequence[bytes],
+    min_size: int,
+) -> str | None:
+    """Return file_path's text with moved links rewritten, or None if nothing changed."""
+    try:
+        # The only stat() per file. Non-regular entries (broken symlinks fail
+        # here, FIFOs would block on read) and files shorter than every moved
+        # name cannot need rewriting.
+        st = file_path.stat()
+        if not stat.S_ISREG(st.st_mode) or st.st_size < min_size:
+            return None
+        raw = file_path.read_bytes()
+    except OSError:
+        # One unreadable file must not abort the run after files were moved.
+        return None
+
+    # Most files mention none of the moved files; reject them before decoding.
+    if not any(basename in raw for basename in moved_basenames):
+        return None
+
+    try:
+        text = raw.decode("utf-8")
+    except UnicodeDecodeError:
+        return None
+
+    replacements: Dict[str, str] = {}
+    for old_abs, new_abs, old_rel in abs_moves:
+        if new_abs.name not in text:
             continue
-        if should_skip(path):
-            continue
-        if any(str(path).endswith(suffix) for suffix in TEXT_SUFFIXES):
-            yield path
 
+        new_rel = pathlib.Path(os.path.relpath(new_abs, file_path.parent)).as_posix()
+        old_rel_from_file = pathlib.Path(
+            os.path.relpath(old_abs, file_path.parent)
+        ).as_posix()
 
-def update_links(moves: Sequence[Tuple[pathlib.Path, pathlib.Path]]) -> List[pathlib.Path]:
-    if not moves:
-        return []
+        for needle in (old_rel, f"./{old_rel}", old_rel_from_file, f"./{old_rel_from_file}"):
+            replacements.setdefault(needle, new_rel)
 
-    updated: List[pathlib.Path] = []
-    mapping: Dict[str, pathlib.Path] = {
-        move[0].relative_to(ROOT).as_posix(): move[1] for move in moves
-    }
-
-    for file_path in iter_text_files():
-        try:
-            text = file_path.read_text(encoding="utf-8")
-        except UnicodeDecodeError:
-            continue
+    if not replacements:
+        return None
 
-        original = text
-        for old_rel, new_abs in mapping.items():
-            new_rel = pathlib.Path(os.path.relpath(new_abs, file_path.parent)).as_posix()
-            old_rel_from_file = pathlib.Path(
-                os.path.relpath(ROOT / old_rel, file_path.parent)
-            ).as_posix()
+    # One pass over the text, longest needle first, so a rewritten link is
+    # never matched again by a shorter needle.
+    pattern = re.compile(
+        "|".join(re.escape(needle) for needle in sorted(replacements, key=len, reverse=True))
+    )
+    new_text = pattern.sub(lambda match: replacements[match.group(0)], text)
+    return new_text if new_text != text else None
 
-            candidates = {
-                old_rel,
-                f"./{old_rel}",
-                old_rel_from_file,
-                f"./{old_rel_from_file}",
-            }
 
-            for needle in candidates:
-                if needle in text:
-                    text = text.replace(needle, new_rel)
+def update_links(
+    moves: Sequence[Tuple[pathlib.Path, pathlib.Path]],
+    text_files: Iterable[pathlib.Path],
+    rel_paths: Dict[pathlib.Path, str],
+) -> List[pathlib.Path]:
+    if not moves:
+        return []
 
-        if text != original:
-            file_path.write_text(text, encoding="utf-8")
-            updated.append(file_path)
+    updated: List[pathlib.Path] = []
+    mapping: Dict[str, pathlib.Path] = {rel_paths[move[0]]: move[1] for move in moves}
+    # Every candidate needle ends with the moved file's name, so a plain
+    # substring check on it lets us skip the relpath work for most files.
+    abs_moves = [(ROOT / old_rel, new_abs, old_rel) for old_rel, new_abs in mapping.items()]
+    moved_basenames = [move[0].name.encode() for move in moves]
+    min_size = min(len(basename) for basename in moved_basenames)
+
+    # Reads and scans run in worker threads; writes stay on this thread.
+    files = apply_moves(text_files, moves)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        results = executor.map(
+            lambda path: _rewrite_links(path, abs_moves, moved_basenames, min_size), files
+        )
+        for file_path, new_text in zip(files, results):
+            if new_text is not None:
+                # The text was decoded from raw bytes, so keep its line endings
+                # as-is instead of translating "\n" on write.
+                file_path.write_text(new_text, encoding="utf-8", newline="")
+                updated.append(file_path)
 
     return updated
 
@@ -195,11 +281,13 @@ def main() -> None:
     parser.add_argument("--fix", action="store_true", help="Move stray files and update links.")
     args = parser.parse_args()
 
-    stray = find_stray_markdown()
+    md_files, text_files = scan_repo()
+    stray = find_stray_markdown(md_files)
+    moves: List[Tuple[pathlib.Path, pathlib.Path]] = []
     if args.fix and stray:
         print(f"Moving {len(stray)} Markdown file(s) into docs/... folders")
         moves = move_stray_files(stray)
-        updated = update_links(moves)
+        updated = update_links(moves, text_files, md_files)
         if updated:
             print(f"Updated links in {len(updated)} file(s)")
     elif stray:
@@ -213,9 +301,12 @@ def main() -> None:
     ensure_docs_root_only_index()
 
     if args.fix:
-        stray_after = find_stray_markdown()
+        stray_after = find_stray_markdown(apply_moves(md_files, moves))
         if stray_after:
-            remaining = "\n".join(f" - {p.relative_to(ROOT)}" for p in stray_after)
+            # Moved files are not keys of md_files; compute their path instead.
+            remaining = "\n".join(
+                f" - {md_files.get(p) or p.relative_to(ROOT).as_posix()}" for p in stray_after
+            )
             raise SystemExit(
                 "Some Markdown files are still outside docs/ after attempting to fix:\n"
                 f"{remaining}"
@@ -9,6 +9,9 @@ missing.
 
 from __future__ import annotations
 
+import concurrent.futures
+import functools
+import os
 import re
 import sys
 import urllib.parse
@@ -28,72 +31,125 @@ SKIP_DIRS = {
     "vendor-bin",
 }
 
-LINK_RE = re.compile(r"\[[^\]]+\]\(([^)]+)\)")
+LINK_RE = re.compile(r"\[[^\]]+\]\(([^)]+)\)", re.ASCII)
+# Cheap probe so files without any inline link skip the capturing regex.
+_HAS_LINK = re.compile(r"\]\(", re.ASCII)
 SKIP_SCHEMES = {"http", "https", "mailto", "tel"}
+# Characters that make urlparse do more than split off the fragment/query.
+_URLPARSE_CHARS = re.compile(r"[:;\t\r\n]")
 
 
 def iter_markdown() -> list[Path]:
     files: list[Path] = []
-    for path in ROOT.rglob("*.md"):
-        if any(part in SKIP_DIRS for part in path.parts):
-            continue
-        files.append(path)
+    stack = [ROOT]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    # Prune ignored directories before descending into them.
+                    if entry.name not in SKIP_DIRS:
+                        stack.append(entry.path)
+                # Symlinked Markdown files are checked too; symlinked
+                # directories are not descended into.
+                elif entry.name.endswith(".md") and entry.is_file():
+                    files.append(Path(entry.path))
     return files
 
 
+def _href_path(href: str) -> str:
+    """Return the path component of href, skipping urlparse for plain relative links."""
+    if _URLPARSE_CHARS.search(href) is None and not href.startswith("//") and href[:1] > " ":
+        return href.partition("#")[0].partition("?")[0]
+    return urllib.parse.urlparse(href).path
+
+
 def should_check(href: str) -> bool:
     href = href.strip()
     if not href or href.startswith("#") or href.startswith("//"):
         return False
 
-    parsed = urllib.parse.urlparse(href)
-    if parsed.scheme in SKIP_SCHEMES:
-        return False
+    if ":" in href:
+        parsed = urllib.parse.urlparse(href)
+        if parsed.scheme in SKIP_SCHEMES:
+            return False
+        path = parsed.path
+    else:
+        path = _href_path(href)
 
     # We only validate links pointing to Markdown files.
-    path = parsed.path
     return path.endswith(".md")
 
 
-def resolve_target(current_file: Path, href: str) -> Path | None:
-    parsed = urllib.parse.urlparse(href)
-    path = urllib.parse.unquote(parsed.path)
+def resolve_target(current_file: Path, href: str, follow_symlinks: bool = False) -> Path | None:
+    path = _href_path(href)
+    if "%" in path:
+        path = urllib.parse.unquote(path)
 
     # Remove fragments and queries
     path = path.split("#", 1)[0].split("?", 1)[0]
 
-    target = Path(path)
-    if not target.is_absolute():
-        target = (current_file.parent / target).resolve()
+    if path.startswith("/"):
+        target = os.path.join(ROOT, path.lstrip("/"))
     else:
-        target = (ROOT / target.relative_to("/")).resolve()
+        target = os.path.join(current_file.parent, path)
+
+    # Lexical normalisation avoids stat()ing every path component, but it
+    # disagrees with the filesystem when ".." follows a symlinked directory;
+    # callers retry with follow_symlinks=True when the lexical target misses.
+    # A lexical hit is accepted as-is, even if a symlink on the way points
+    # outside ROOT.
+    if follow_symlinks:
+        target = Path(os.path.realpath(target))
+    else:
+        target = Path(os.path.normpath(target))
 
-    try:
-        target.relative_to(ROOT)
-    except ValueError:
+    if not target.is_relative_to(ROOT):
         return None
 
     return target
 
 
-def main() -> int:
+@functools.lru_cache(maxsize=None)
+def _exists(path_str: str) -> bool:
+    return Path(path_str).exists()
+
+
+def _check_file(md_file: Path, known: set[str]) -> list[str]:
+    try:
+        text = md_file.read_text(encoding="utf-8")
+    except UnicodeDecodeError:
+        return []
+
+    if _HAS_LINK.search(text) is None:
+        return []
+
     errors: list[str] = []
+    for match in LINK_RE.finditer(text):
+        href = match.group(1)
+        if not should_check(href):
+            continue
 
-    for md_file in iter_markdown():
-        try:
-            text = md_file.read_text(encoding="utf-8")
-        except UnicodeDecodeError:
+        target = resolve_target(md_file, href)
+        if target is not None and (str(target) in known or _exists(str(target))):
             continue
 
-        for match in LINK_RE.finditer(text):
-            href = match.group(1)
-            if not should_check(href):
-                continue
+        target = resolve_target(md_file, href, follow_symlinks=True)
+        if target is None or not _exists(str(target)):
+            rel = md_file.relative_to(ROOT)
+            errors.append(f"{rel} -> {href}")
+
+    return errors
 
-            target = resolve_target(md_file, href)
-            if target is None or not target.exists():
-                rel = md_file.relative_to(ROOT)
-                errors.append(f"{rel} -> {href}")
+
+def main() -> int:
+    md_files = iter_markdown()
+    # Links to files found by the walk need no stat() at all.
+    known = {str(path) for path in md_files}
+
+    errors: list[str] = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for file_errors in executor.map(lambda path: _check_file(path, known), md_files):
+            errors.extend(file_errors)
 
     if errors:
         print("Broken Markdown links found:")
@@ -0,0 +1,64 @@
+import importlib.util
+import os
+import pathlib
+import tempfile
+import unittest
+
+SCRIPT = pathlib.Path(__file__).resolve().parents[2] / "scripts" / "organize-docs.py"
+
+spec = importlib.util.spec_from_file_location("organize_docs", SCRIPT)
+organize_docs = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(organize_docs)
+
+
+class OrganizeDocsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = pathlib.Path(tmp.name)
+        (self.root / "app").mkdir()
+
+    def rewrite(self, file_path: pathlib.Path) -> str | None:
+        old_abs = self.root / "NOTES.md"
+        new_abs = self.root / "docs" / "admin" / "NOTES.md"
+        return organize_docs._rewrite_links(
+            file_path, [(old_abs, new_abs, "NOTES.md")], [b"NOTES.md"], len("NOTES.md")
+        )
+
+    def test_rewrite_links_ignores_non_regular_files(self) -> None:
+        fifo = self.root / "app" / "pipe.js"
+        os.mkfifo(fifo)
+
+        self.assertIsNone(self.rewrite(fifo))
+
+    def test_rewrite_links_ignores_unreadable_files(self) -> None:
+        broken = self.root / "app" / "broken.js"
+        os.symlink(self.root / "missing.js", broken)
+
+        self.assertIsNone(self.rewrite(broken))
+
+    def test_rewrite_links_updates_relative_links(self) -> None:
+        ref = self.root / "app" / "ref.js"
+        ref.write_text("// see ../NOTES.md\n", encoding="utf-8")
+
+        self.assertEqual(self.rewrite(ref), "// see ../docs/admin/NOTES.md\n")
+
+    def test_update_links_keeps_crlf_line_endings(self) -> None:
+        original_root = organize_docs.ROOT
+        organize_docs.ROOT = self.root
+        self.addCleanup(setattr, organize_docs, "ROOT", original_root)
+        source = self.root / "NOTES.md"
+        destination = self.root / "docs" / "admin" / "NOTES.md"
+        ref = self.root / "app" / "ref.md"
+        ref.write_bytes(b"# Ref\r\nsee ../NOTES.md\r\n")
+
+        updated = organize_docs.update_links(
+            [(source, destination)], [ref], {source: "NOTES.md"}
+        )
+
+        self.assertEqual(updated, [ref])
+        self.assertEqual(ref.read_bytes(), b"# Ref\r\nsee ../docs/admin/NOTES.md\r\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
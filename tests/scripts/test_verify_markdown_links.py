@@ -0,0 +1,58 @@
+import importlib.util
+import os
+import pathlib
+import tempfile
+import unittest
+
+SCRIPT = pathlib.Path(__file__).resolve().parents[2] / "scripts" / "verify-markdown-links.py"
+
+spec = importlib.util.spec_from_file_location("verify_markdown_links", SCRIPT)
+verify_markdown_links = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(verify_markdown_links)
+
+
+class VerifyMarkdownLinksTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = pathlib.Path(tmp.name).resolve()
+        original_root = verify_markdown_links.ROOT
+        verify_markdown_links.ROOT = self.root
+        self.addCleanup(setattr, verify_markdown_links, "ROOT", original_root)
+
+    def found(self) -> list[str]:
+        return sorted(
+            path.relative_to(self.root).as_posix() for path in verify_markdown_links.iter_markdown()
+        )
+
+    def test_includes_symlinked_markdown_files(self) -> None:
+        (self.root / "docs").mkdir()
+        (self.root / "real.md").write_text("[x](missing.md)\n", encoding="utf-8")
+        os.symlink(self.root / "real.md", self.root / "docs" / "alias.md")
+
+        self.assertEqual(self.found(), ["docs/alias.md", "real.md"])
+
+    def test_skips_symlinked_directories_and_skip_dirs(self) -> None:
+        (self.root / "guides").mkdir()
+        (self.root / "guides" / "index.md").write_text("# Guides\n", encoding="utf-8")
+        os.symlink(self.root / "guides", self.root / "guides-link")
+        (self.root / "vendor").mkdir()
+        (self.root / "vendor" / "README.md").write_text("# Vendor\n", encoding="utf-8")
+
+        self.assertEqual(self.found(), ["guides/index.md"])
+
+    def test_resolves_parent_links_through_symlinked_directories(self) -> None:
+        for folder in ("a", "b", "c"):
+            (self.root / "docs" / folder).mkdir(parents=True)
+        (self.root / "docs" / "a" / "i.md").write_text("# I\n", encoding="utf-8")
+        os.symlink("../b", self.root / "docs" / "c" / "blink")
+        page = self.root / "docs" / "c" / "z.md"
+        page.write_text("[l](blink/../a/i.md) [m](blink/../a/missing.md)\n", encoding="utf-8")
+
+        errors = verify_markdown_links._check_file(page, {str(page)})
+
+        self.assertEqual(errors, ["docs/c/z.md -> blink/../a/missing.md"])
+
+
+if __name__ == "__main__":
+    unittest.main()